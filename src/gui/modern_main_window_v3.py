@@ -661,6 +661,30 @@ class ModernAppV3(ctk.CTk):
             text_color=self.theme['text_secondary']
         ).grid(row=3, column=2, padx=(5, 15), pady=10, sticky="w")
 
+        # Параллельная обработка строк CSV
+        ctk.CTkLabel(
+            timeouts_frame,
+            text="Параллельных профилей:",
+            font=(ModernTheme.FONT['family'], 11),
+            text_color=self.theme['text_primary']
+        ).grid(row=4, column=0, padx=(15, 5), pady=10, sticky="w")
+
+        self.max_workers_var = tk.StringVar(value="1")  # По умолчанию строки по очереди
+        max_workers_entry = ctk.CTkEntry(
+            timeouts_frame,
+            textvariable=self.max_workers_var,
+            width=60,
+            font=(ModernTheme.FONT['family'], 11)
+        )
+        max_workers_entry.grid(row=4, column=1, padx=5, pady=10, sticky="ew")
+
+        ctk.CTkLabel(
+            timeouts_frame,
+            text="строк CSV одновременно (1 = по очереди, каждая строка - свой профиль)",
+            font=(ModernTheme.FONT['family'], 9),
+            text_color=self.theme['text_secondary']
+        ).grid(row=4, column=2, padx=(5, 15), pady=10, sticky="w")
+
         # ========== КНОПКИ ДЕЙСТВИЙ (АДАПТИВНЫЙ LAYOUT 2x3) ==========
         btn_frame = ctk.CTkFrame(tab, fg_color="transparent")
         btn_frame.grid(row=4, column=0, sticky="ew", padx=24, pady=(8, 24))
@@ -1035,7 +1059,9 @@ class ModernAppV3(ctk.CTk):
                 'profile': profile_config,
                 # 🔥 СИМУЛЯЦИЯ ВВОДА ТЕКСТА
                 'simulate_typing': self.simulate_typing_var.get(),
-                'typing_delay': int(self.typing_delay_var.get()) if self.typing_delay_var.get().isdigit() else 100
+                'typing_delay': int(self.typing_delay_var.get()) if self.typing_delay_var.get().isdigit() else 100,
+                # 🔥 ПАРАЛЛЕЛЬНАЯ ОБРАБОТКА СТРОК CSV
+                'max_workers': int(self.max_workers_var.get()) if self.max_workers_var.get().isdigit() else 1
             }
 
             print(f"[DEBUG] API Token: {config['api_token'][:10]}..." if config['api_token'] else "[DEBUG] API Token: пуст")  # DEBUG
@@ -4,10 +4,176 @@ Provider: smart_no_api
 Генератор скриптов с Octobrowser API, обязательными прокси и умными альтернативами
 """
 
+import io
 import json
+import re
+import tokenize
 from typing import Dict, List
 
 
+# Паттерны для _wrap_actions_for_resilience (собираются один раз, а не на каждой строке)
+# 'with' блоки expect_popup/expect_navigation (page, page1, page2, page3)
+_WITH_BLOCK_RE = re.compile(r'with page[123]?\.expect_(?:popup|navigation)\(')
+
+# Действия на popup страницах (page1, page2, page3)
+_POPUP_RE = re.compile(r'page[123]\.')
+
+# Переменная popup страницы и селектор элемента в действии (см. _popup_retry_call)
+_PAGE_VAR_RE = re.compile(r'(page\d+)\.')
+_SELECTOR_RE = re.compile(r'\.get_by_\w+\([^)]+\)|\.locator\([^)]+\)')
+
+# Критичные действия - НЕ оборачиваем (должны выполниться)
+_CRITICAL_PATTERNS = (
+    'page.goto(',
+    'with page.expect_popup(',
+    'with page.expect_navigation(',
+    'check_heading(',  # Already has resilience built-in
+    '= page',  # Variable assignments (page1 = ...)
+    'wait_for_navigation(',
+    'page1.',  # Actions on popup windows (page1, page2, etc.) - critical
+    'page2.',
+    'page3.',
+)
+
+# Команда #pauseN - пауза N секунд (см. _handle_special_command)
+_PAUSE_RE = re.compile(r'#pause(\d+)')
+
+# Описание элемента для логов (_extract_action_description), в порядке приоритета:
+# role+name, text, placeholder, locator
+_ROLE_DESC_RE = re.compile(r'get_by_role\(["\'](\w+)["\']\s*,\s*name=["\']([^"\']+)["\']')
+_TEXT_DESC_RE = re.compile(r'get_by_text\(["\']([^"\']+)["\']')
+_PLACEHOLDER_DESC_RE = re.compile(r'get_by_placeholder\(["\']([^"\']+)["\']')
+_LOCATOR_DESC_RE = re.compile(r'locator\(["\']([^"\']+)["\']')
+
+# Вызываемый метод действия и его описание, когда элемент не распознан
+_ACTION_VERB_RE = re.compile(r'\.(click|fill|select_option|check|uncheck|set_checked|press|type)\(')
+_VERB_DESCRIPTIONS = {
+    'click': "click element",
+    'fill': "fill field",
+    'select_option': "select option",
+    'check': "check checkbox",
+}
+
+# Всё, что _wrap_actions_for_resilience может изменить: действия, with-блоки
+# expect_popup/expect_navigation, присваивание popup страницы и маркер #optional
+_WRAP_TRIGGER_RE = re.compile(
+    _ACTION_VERB_RE.pattern
+    + r'|\.expect_(?:popup|navigation)\(|_info\.value|(?i:#optional)'
+)
+
+# Действия, которые оборачиваются в try-except (click, fill, etc.)
+_ACTION_PATTERNS = (
+    '.click(',
+    '.fill(',
+    '.select_option(',
+    '.check(',
+    '.uncheck(',
+    '.set_checked(',
+    '.press(',
+    '.type(',
+)
+
+# Начало строки кода до первого '#' вне строковых литералов (см. _strip_trailing_comment)
+_CODE_PREFIX_RE = re.compile(r'''(?:[^'"#\\]|"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')*''')
+
+# Готовые строки отступов: вместо нового ' ' * n на каждую строку кода
+_INDENTS = tuple(' ' * i for i in range(128))
+
+# Retry-цикл прямо в коде для popup действий, которые нельзя передать в
+# popup_retry() как lambda (присваивание и т.п.), см. _popup_retry_call.
+# Подстановки: I - отступ, page - переменная страницы, code - оператор действия,
+# desc - repr() описания для логов, scroll/final - уже собранные вложенные части
+_POPUP_INLINE_RETRY_TEMPLATE = '''\
+%(I)s# Retry logic for popup page action with progressive delays and smart scrolling
+%(I)smax_retries = 5
+%(I)sprogressive_delays = [5, 10, 15, 20, 30]  # Progressive delays in seconds
+%(I)sfor retry_attempt in range(max_retries):
+%(I)s    try:
+%(I)s        if retry_attempt > 0:
+%(I)s            delay = progressive_delays[retry_attempt - 1]
+%(I)s            print(f"[POPUP_RETRY] Attempt {retry_attempt+1}/{max_retries} (waiting {delay}s): " + %(desc)s, flush=True)
+%(I)s            time.sleep(delay)
+%(I)s            # Wait for page to stabilize
+%(I)s            %(page)s.wait_for_load_state('domcontentloaded', timeout=5000)
+%(scroll)s%(I)s        %(code)s
+%(I)s        print("[POPUP_ACTION] [OK] " + %(desc)s, flush=True)
+%(I)s        break  # Success - exit retry loop
+%(I)s    except PlaywrightTimeout:
+%(I)s        if retry_attempt < max_retries - 1:
+%(I)s            print(f"[POPUP_RETRY] Timeout on attempt {retry_attempt+1}, retrying with longer delay...", flush=True)
+%(I)s            continue
+%(I)s        print(f"[POPUP_ACTION] [ERROR] Failed after {max_retries} attempts (total {sum(progressive_delays)}s): " + %(desc)s, flush=True)
+%(final)s'''
+
+# Прокрутка к элементу перед кликом (только для click() по селектору)
+_POPUP_INLINE_SCROLL_TEMPLATE = '''\
+%(I)s        # Try to scroll element into view if needed
+%(I)s        try:
+%(I)s            _element = %(element)s
+%(I)s            _element.scroll_into_view_if_needed(timeout=3000)
+%(I)s            time.sleep(0.2)  # Wait for scroll animation
+%(I)s            print(f"[POPUP_ACTION] Element scrolled into view", flush=True)
+%(I)s        except:
+%(I)s            print(f"[POPUP_ACTION] [WARNING] Could not scroll element, will try with original selector", flush=True)
+'''
+
+# Последняя попытка для опциональной кнопки (show more, expand...) - не падаем
+_POPUP_INLINE_FINAL_OPTIONAL_TEMPLATE = '''\
+%(I)s        # Smart detection: This appears to be an optional expandable button
+%(I)s        print(f"[POPUP_ACTION] [INFO] Button may not exist if content already loaded", flush=True)
+%(I)s        print(f"[POPUP_ACTION] [INFO] Checking page state...", flush=True)
+%(I)s        try:
+%(I)s            %(page)s.wait_for_load_state('domcontentloaded', timeout=3000)
+%(I)s            print(f"[POPUP_ACTION] [OK] Page stable - content likely already loaded, continuing...", flush=True)
+%(I)s        except:
+%(I)s            print(f"[POPUP_ACTION] [WARNING] Page check failed but treating as optional", flush=True)'''
+
+# Последняя попытка для критичной кнопки - пробрасываем исключение
+_POPUP_INLINE_FINAL_CRITICAL_TEMPLATE = '''\
+%(I)s        raise  # Re-raise on final attempt for critical buttons'''
+
+
+def _spaces(width: int) -> str:
+    """Строка из width пробелов (до 128 - из кеша _INDENTS)"""
+    return _INDENTS[width] if width < len(_INDENTS) else ' ' * width
+
+
+def _strip_trailing_comment(code: str) -> str:
+    """Убрать хвостовой # комментарий строки кода (# внутри строковых литералов не трогаем)"""
+    if '#' not in code:
+        return code
+    # Быстрый путь: код до '#' разбирается регуляркой (строки в ' и " с экранированием)
+    end = _CODE_PREFIX_RE.match(code).end()
+    if end < len(code) and code[end] == '#':
+        return code[:end].rstrip()
+    # Не смогли разобрать (незакрытая строка и т.п.) - полный tokenize
+    try:
+        for token in tokenize.generate_tokens(io.StringIO(code).readline):
+            if token.type == tokenize.COMMENT:
+                return code[:token.start[1]].rstrip()
+    except (tokenize.TokenError, SyntaxError):
+        pass
+    return code
+
+
+def _is_statement(code: str) -> bool:
+    """Компилируется ли код как оператор"""
+    try:
+        compile(code, '<action>', 'exec')
+    except (SyntaxError, ValueError):
+        return False
+    return True
+
+
+def _is_expression(code: str) -> bool:
+    """Можно ли поставить код телом lambda (выражение, а не оператор)"""
+    try:
+        compile(code, '<action>', 'eval')
+    except (SyntaxError, ValueError):
+        return False
+    return True
+
+
 class Generator:
     """Генератор для Playwright через Octobrowser API с прокси"""
 
@@ -28,13 +194,19 @@ class Generator:
         csv_embed_mode = config.get('csv_embed_mode', True)
         proxy_config = config.get('proxy', {})
         profile_config = config.get('profile', {})
+        # Параллельная обработка строк CSV (1 = последовательно).
+        # Пустое/None/нечисловое значение - как 1, генерацию не роняем
+        try:
+            max_workers = max(1, int(config.get('max_workers') or 1))
+        except (TypeError, ValueError):
+            max_workers = 1
 
         # 🔥 СИМУЛЯЦИЯ ВВОДА ТЕКСТА
         self.simulate_typing = config.get('simulate_typing', True)
         self.typing_delay = config.get('typing_delay', 100)
 
         script = self._generate_imports()
-        script += self._generate_config(api_token, csv_filename, csv_data, csv_embed_mode, proxy_config)
+        script += self._generate_config(api_token, csv_filename, csv_data, csv_embed_mode, proxy_config, max_workers)
         script += self._generate_octobrowser_functions(profile_config, proxy_config)
         script += self._generate_helpers()
         script += self._generate_csv_loader()
@@ -53,14 +225,16 @@ Provider: smart_no_api (OCTOBROWSER API + PROXY + FALLBACKS)
 
 import csv
 import time
+import threading
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from playwright.sync_api import sync_playwright, expect, TimeoutError as PlaywrightTimeout
 from typing import Dict, List, Optional
 
 '''
 
     def _generate_config(self, api_token: str, csv_filename: str, csv_data: List[Dict],
-                         csv_embed_mode: bool, proxy_config: Dict) -> str:
+                         csv_embed_mode: bool, proxy_config: Dict, max_workers: int = 1) -> str:
         config = f'''# ============================================================
 # КОНФИГУРАЦИЯ
 # ============================================================
@@ -103,6 +277,14 @@ PROXY_PASSWORD = "{proxy_config.get('password', '')}"
 # Таймауты (оптимизированы для быстрого fail-over при неправильном флоу)
 DEFAULT_TIMEOUT = 10000  # 10 секунд (было 30s, уменьшено для быстрых фейлов)
 NAVIGATION_TIMEOUT = 60000  # 60 секунд
+PROFILE_SYNC_TIMEOUT = 260  # секунд на синхронизацию нового профиля с локальным Octobrowser
+PROFILE_START_MIN_ATTEMPTS = 8  # попыток запуска даже если таймаут уже истёк (медленный ответ API)
+
+'''
+
+        config += f'''# Параллельная обработка строк CSV (каждая строка - свой профиль)
+# 1 = строки по очереди; >1 = столько профилей работают одновременно
+MAX_WORKERS = {max_workers}
 
 '''
         return config
@@ -230,20 +412,27 @@ def check_local_api() -> bool:
         return False
 
 
-def start_profile(profile_uuid: str) -> Optional[Dict]:
-    """Запустить профиль и получить CDP endpoint"""
+def start_profile(profile_uuid: str, sync_timeout: float = PROFILE_SYNC_TIMEOUT) -> Optional[Dict]:
+    """
+    Запустить профиль и получить CDP endpoint
+
+    Пока новый профиль не синхронизирован с локальным Octobrowser, API отвечает 404.
+    Вместо фиксированного ожидания опрашиваем API с нарастающим интервалом
+    (0.25s -> 0.5s -> 1s -> 2s) - запуск происходит сразу, как только профиль готов.
+    Сдаёмся только когда истёк sync_timeout И сделано не меньше
+    PROFILE_START_MIN_ATTEMPTS попыток: один долгий запрос (timeout=120)
+    не должен съесть весь бюджет ожидания.
+    """
     url = f"{{LOCAL_API_URL}}/profiles/start"
 
-    # Retry logic для синхронизации профиля с локальным Octobrowser
-    max_retries = 8
-    for attempt in range(max_retries):
+    # Polling синхронизации профиля с локальным Octobrowser
+    deadline = time.monotonic() + sync_timeout
+    poll_interval = 0.25
+    attempt = 0
+    while True:
+        attempt += 1
         try:
-            if attempt > 0:
-                wait_time = 2 ** (attempt - 1) * 2  # 0s, 2s, 4s, 8s, 16s
-                print(f"[PROFILE] Ожидание синхронизации профиля: {{wait_time}}s")
-                time.sleep(wait_time)
-
-            print(f"[PROFILE] Попытка запуска {{attempt+1}}/{{max_retries}}: {{profile_uuid}}")
+            print(f"[PROFILE] Попытка запуска {{attempt}}: {{profile_uuid}}")
 
             # ============================================================
             # ⚠️ КРИТИЧЕСКИ ВАЖНО: ЕДИНСТВЕННО ПРАВИЛЬНЫЙ СПОСОБ ЗАПУСКА ПРОФИЛЯ!
@@ -279,18 +468,19 @@ def start_profile(profile_uuid: str) -> Optional[Dict]:
             elif response.status_code == 404:
                 # Profile not synced yet - retry
                 print(f"[PROFILE] [!] Профиль еще не синхронизирован с локальным Octobrowser")
-                continue
             else:
                 print(f"[PROFILE] [ERROR] Ошибка запуска: {{response.status_code}} - {{response.text}}")
                 return None
         except Exception as e:
             print(f"[PROFILE] [ERROR] Exception при запуске: {{e}}")
-            if attempt == max_retries - 1:
-                import traceback
-                traceback.print_exc()
-            continue
 
-    print(f"[PROFILE] [ERROR] Не удалось запустить профиль после {{max_retries}} попыток")
+        if attempt >= PROFILE_START_MIN_ATTEMPTS and time.monotonic() + poll_interval > deadline:
+            break
+        print(f"[PROFILE] Ожидание синхронизации профиля: {{poll_interval}}s")
+        time.sleep(poll_interval)
+        poll_interval = min(poll_interval * 2, 2.0)
+
+    print(f"[PROFILE] [ERROR] Не удалось запустить профиль за {{sync_timeout}}s ({{attempt}} попыток)")
     print(f"[PROFILE] [!] Убедитесь что Octobrowser запущен локально (http://localhost:58888)")
     return None
 
@@ -481,6 +671,62 @@ def safe_action(action_fn, description="action", critical=False):
         return False
 
 
+def popup_retry(page, action_fn, description="action", element_fn=None, optional=False):
+    """
+    Действие на popup странице (page1/page2/page3) с повторными попытками
+
+    Popup страницы грузятся медленно, поэтому действие повторяется до 5 раз
+    с прогрессивными задержками (5s, 10s, 15s, 20s, 30s).
+
+    Args:
+        page: Playwright page, на которой выполняется действие
+        action_fn: Lambda функция с действием (например: lambda: page1.get_by_text("Next").click())
+        description: Описание действия для логов
+        element_fn: Lambda, возвращающая locator элемента - перед действием к нему прокручиваем
+        optional: Если True - после всех попыток НЕ бросает exception (кнопки "show more" и т.п.)
+
+    Returns:
+        True если действие выполнено, False если опциональное действие не удалось
+    """
+    max_retries = 5
+    progressive_delays = [5, 10, 15, 20, 30]  # Progressive delays in seconds
+    for retry_attempt in range(max_retries):
+        try:
+            if retry_attempt > 0:
+                delay = progressive_delays[retry_attempt - 1]
+                print(f"[POPUP_RETRY] Attempt {retry_attempt+1}/{max_retries} (waiting {delay}s): {description}", flush=True)
+                time.sleep(delay)
+                # Wait for page to stabilize
+                page.wait_for_load_state('domcontentloaded', timeout=5000)
+            if element_fn is not None:
+                # Try to scroll element into view if needed
+                try:
+                    element_fn().scroll_into_view_if_needed(timeout=3000)
+                    time.sleep(0.2)  # Wait for scroll animation
+                    print(f"[POPUP_ACTION] Element scrolled into view", flush=True)
+                except:
+                    print(f"[POPUP_ACTION] [WARNING] Could not scroll element, will try with original selector", flush=True)
+            action_fn()
+            print(f"[POPUP_ACTION] [OK] {description}", flush=True)
+            return True
+        except PlaywrightTimeout:
+            if retry_attempt < max_retries - 1:
+                print(f"[POPUP_RETRY] Timeout on attempt {retry_attempt+1}, retrying with longer delay...", flush=True)
+                continue
+            print(f"[POPUP_ACTION] [ERROR] Failed after {max_retries} attempts (total {sum(progressive_delays)}s): {description}", flush=True)
+            if not optional:
+                raise  # Re-raise on final attempt for critical buttons
+            # Smart detection: This appears to be an optional expandable button
+            print(f"[POPUP_ACTION] [INFO] Button may not exist if content already loaded", flush=True)
+            print(f"[POPUP_ACTION] [INFO] Checking page state...", flush=True)
+            try:
+                page.wait_for_load_state('domcontentloaded', timeout=3000)
+                print(f"[POPUP_ACTION] [OK] Page stable - content likely already loaded, continuing...", flush=True)
+            except:
+                print(f"[POPUP_ACTION] [WARNING] Page check failed but treating as optional", flush=True)
+    return False
+
+
 def wait_for_navigation(page, timeout=30000):
     """Ожидание завершения навигации"""
     try:
@@ -506,9 +752,18 @@ def load_csv_data() -> List[Dict]:
     else:
         data = []
         try:
-            with open(CSV_FILENAME, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                data = list(reader)
+            # Буфер 1 MiB вместо 8 KiB по умолчанию - меньше read() на больших CSV
+            with open(CSV_FILENAME, 'r', encoding='utf-8', buffering=1 << 20, newline='') as f:
+                reader = csv.reader(f)
+                header = tuple(next(reader, ()))
+                # Шаблон строки: недостающие колонки = None (как в csv.DictReader)
+                template = dict.fromkeys(header)
+                for row in reader:
+                    if not row:
+                        continue  # DictReader тоже пропускает пустые строки
+                    item = template.copy()
+                    item.update(zip(header, row))
+                    data.append(item)
         except Exception as e:
             print(f"[ERROR] Load CSV: {e}")
         return data
@@ -536,13 +791,13 @@ def load_csv_data() -> List[Dict]:
 
         Оставляет только действия пользователя (page.goto, page.get_by_role, etc.)
         """
-        import re
-
         # CRITICAL FIX: Normalize tabs to spaces BEFORE processing
         # This prevents TabError and IndentationError when user copies code with mixed tabs/spaces
         user_code = user_code.replace('\t', '    ')  # Replace all tabs with 4 spaces
 
-        lines = user_code.split('\n')
+        # Только '\n' (а не splitlines): \x0c, \x85, U+2028 и т.п. допустимы внутри строковых
+        # литералов, например fill("Line1\u2028Line2"). '\r' от CRLF срезаем сами
+        lines = [line.rstrip('\r') for line in user_code.split('\n')]
         cleaned_lines = []
         in_run_function = False
         base_indent = None
@@ -608,7 +863,7 @@ def load_csv_data() -> List[Dict]:
                         current_indent = max(0, current_indent - base_indent)
 
                     # Generate check_heading call with fast timeout (5s) for quick fail-over
-                    transformed_line = ' ' * current_indent + f'check_heading(page, ["{heading_text}"], timeout=5000)'
+                    transformed_line = _spaces(current_indent) + f'check_heading(page, ["{heading_text}"], timeout=5000)'
                     cleaned_lines.append(transformed_line)
                     continue
                 else:
@@ -653,7 +908,6 @@ def load_csv_data() -> List[Dict]:
         if not self.simulate_typing or '.fill(' not in code:
             return code
 
-        import re
         # Заменить .fill(...) на .press_sequentially(..., delay=X)
         # Паттерн: .fill("text") или .fill('text') или .fill(variable)
         pattern = r'\.fill\(([^)]+)\)'
@@ -676,79 +930,74 @@ def load_csv_data() -> List[Dict]:
         - with page.expect_popup() (критично - НЕ оборачиваем)
         - page.goto() (критично - НЕ оборачиваем)
         """
-        import re
+        # Быстрый путь: нечего оборачивать (только goto/check_heading и т.п.) -
+        # один проход регулярки по всему коду вместо построчного разбора
+        if not _WRAP_TRIGGER_RE.search(code):
+            return code
 
-        lines = code.split('\n')
-        wrapped_lines = []
-        i = 0
+        return '\n'.join(self._wrap_iter(code))
+
+    def _wrap_iter(self, code: str):
+        """
+        Генератор строк для _wrap_actions_for_resilience
+
+        Выдаёт строки результата по одной, без промежуточного списка wrapped_lines.
+        Отдельные элементы могут содержать несколько строк (join это не ломает).
+        """
         inside_with_block = False
         with_block_indent = 0
+        with_body_seen = False  # У текущего 'with' уже есть строка тела
         next_action_optional = False  # Track #optional marker
         current_page_context = 'page'  # Track current page context (page, page1, page2, page3)
 
-        while i < len(lines):
-            line = lines[i]
-            stripped = line.strip()
+        for line in code.split('\n'):
+            # lstrip() один раз на строку: из него же получаем отступ и stripped
+            lstripped = line.lstrip()
+            indent = len(line) - len(lstripped)
+            indent_str = _spaces(indent)
+            stripped = lstripped.rstrip()
 
             # Check for #optional marker
             if stripped.lower() == '#optional':
                 next_action_optional = True
-                wrapped_lines.append(f"{' ' * (len(line) - len(line.lstrip()))}# Next action is optional (will not fail script if element not found)")
-                i += 1
+                yield f"{indent_str}# Next action is optional (will not fail script if element not found)"
                 continue
 
             # Skip empty lines and regular comments
             if not stripped or stripped.startswith('#'):
-                wrapped_lines.append(line)
-                i += 1
+                yield line
                 continue
 
-            # Get current indentation
-            indent = len(line) - len(line.lstrip())
-            indent_str = ' ' * indent
-
             # Track if we're inside a 'with' block (page, page1, page2, page3)
-            if any(pattern in stripped for pattern in [
-                'with page.expect_popup(',
-                'with page.expect_navigation(',
-                'with page1.expect_popup(',
-                'with page1.expect_navigation(',
-                'with page2.expect_popup(',
-                'with page2.expect_navigation(',
-                'with page3.expect_popup(',
-                'with page3.expect_navigation(',
-            ]):
+            if _WITH_BLOCK_RE.search(stripped):
                 inside_with_block = True
                 with_block_indent = indent
+                with_body_seen = False
+            elif inside_with_block and indent > with_block_indent:
+                with_body_seen = True
 
             # Fix indentation if code inside 'with' block has no indent (BEFORE checking exit!)
-            # This MUST be done before "exited with block" check
-            if inside_with_block and indent <= with_block_indent and stripped and not stripped.startswith('with'):
+            # This MUST be done before "exited with block" check.
+            # Only for the first line after 'with': once the block has a body,
+            # a line at the 'with' indent is the code after the block
+            if (inside_with_block and not with_body_seen and indent <= with_block_indent
+                    and not stripped.startswith('with')):
                 # We're inside a with block but line has same/less indent - FIX IT
                 # This happens when code is copy-pasted and loses indentation
+                with_body_seen = True
                 print(f"[GENERATOR] [WARNING] Fixed indentation inside 'with' block for: {stripped[:50]}")
                 # Add 4 spaces indent - update the actual line
-                line = ' ' * (with_block_indent + 4) + stripped
-                stripped = line.strip()  # Keep stripped version updated
                 indent = with_block_indent + 4  # Update indent for further processing
-                indent_str = ' ' * indent
+                indent_str = _spaces(indent)
+                line = indent_str + stripped
+                stripped = line.strip()  # Keep stripped version updated
             elif inside_with_block and indent <= with_block_indent and not stripped.startswith('with'):
-                # Only exit 'with' block if we didn't just fix indentation
+                # Exit 'with' block: the body is done
                 # and this is not the 'with' statement itself
                 inside_with_block = False
 
             # Check if this is a critical action that should NOT be wrapped (must succeed)
-            is_critical = any(pattern in stripped for pattern in [
-                'page.goto(',
-                'with page.expect_popup(',
-                'with page.expect_navigation(',
-                'check_heading(',  # Already has resilience built-in
-                '= page',  # Variable assignments (page1 = ...)
-                'wait_for_navigation(',
-                'page1.',  # Actions on popup windows (page1, page2, etc.) - critical
-                'page2.',
-                'page3.',
-            ])
+            is_critical = any(pattern in stripped for pattern in _CRITICAL_PATTERNS)
 
             # Actions inside 'with' blocks are critical (must succeed to open popup/navigate)
             # BUT: if #optional marker was set, respect it even inside with blocks
@@ -762,19 +1011,10 @@ def load_csv_data() -> List[Dict]:
                 next_action_optional = False  # Reset marker
 
             # Check if this is a resilient action (click, fill, etc.)
-            is_action = any(pattern in stripped for pattern in [
-                '.click(',
-                '.fill(',
-                '.select_option(',
-                '.check(',
-                '.uncheck(',
-                '.set_checked(',
-                '.press(',
-                '.type(',
-            ])
+            is_action = any(pattern in stripped for pattern in _ACTION_PATTERNS)
 
             # Check if this is a popup page action (page1/page2/page3) that needs retry logic
-            is_popup_action = is_action and any(f'page{n}.' in stripped for n in [1, 2, 3])
+            is_popup_action = is_action and bool(_POPUP_RE.search(stripped))
 
             # Wrap action in try-except if it's resilient (not critical)
             if is_action and not is_critical:
@@ -790,89 +1030,23 @@ def load_csv_data() -> List[Dict]:
                 # 🔥 Replace .fill() with .press_sequentially() for human typing simulation
                 sanitized_code = self._replace_fill_with_typing(sanitized_code)
 
-                wrapped_lines.append(f"{indent_str}try:")
-                wrapped_lines.append(f"{indent_str}    {sanitized_code}")
-                wrapped_lines.append(f"{indent_str}except PlaywrightTimeout:")
-                wrapped_lines.append(f'{indent_str}    print(f"[ACTION] [WARNING] Timeout: {action_desc}", flush=True)')
-                wrapped_lines.append(f'{indent_str}    print(f"[ACTION] [INFO] Элемент не найден - возможно другой вариант флоу, продолжаем...", flush=True)')
-                wrapped_lines.append(f"{indent_str}    pass  # Continue execution")
+                yield f"{indent_str}try:"
+                yield f"{indent_str}    {sanitized_code}"
+                yield f"{indent_str}except PlaywrightTimeout:"
+                yield f'{indent_str}    print(f"[ACTION] [WARNING] Timeout: {action_desc}", flush=True)'
+                yield f'{indent_str}    print(f"[ACTION] [INFO] Элемент не найден - возможно другой вариант флоу, продолжаем...", flush=True)'
+                yield f"{indent_str}    pass  # Continue execution"
             elif is_popup_action and is_critical:
                 # Popup page actions need retry logic with extended timeout
+                # (description goes into a repr() literal, so no manual escaping)
                 action_desc = self._extract_action_description(stripped)
-                action_desc = action_desc.replace("'", "'").replace("'", "'").replace('"', '\\"')
+                action_desc = action_desc.replace("'", "'").replace("'", "'")
                 sanitized_code = stripped.replace("'", "'").replace("'", "'")
 
                 # 🔥 Replace .fill() with .press_sequentially() for human typing simulation
                 sanitized_code = self._replace_fill_with_typing(sanitized_code)
 
-                # Extract page variable and selector for smart handling
-                import re
-                match = re.search(r'(page\d+)\.', stripped)
-                page_var = match.group(1) if match else 'page1'
-
-                # Extract selector information for element checking
-                selector_match = re.search(r'\.get_by_\w+\([^)]+\)', stripped) or re.search(r'\.locator\([^)]+\)', stripped)
-                has_selector = bool(selector_match)
-
-                wrapped_lines.append(f"{indent_str}# Retry logic for popup page action with progressive delays and smart scrolling")
-                wrapped_lines.append(f"{indent_str}max_retries = 5")
-                wrapped_lines.append(f"{indent_str}progressive_delays = [5, 10, 15, 20, 30]  # Progressive delays in seconds")
-                wrapped_lines.append(f"{indent_str}for retry_attempt in range(max_retries):")
-                wrapped_lines.append(f"{indent_str}    try:")
-                wrapped_lines.append(f"{indent_str}        if retry_attempt > 0:")
-                wrapped_lines.append(f'{indent_str}            delay = progressive_delays[retry_attempt - 1]')
-                wrapped_lines.append(f'{indent_str}            print(f"[POPUP_RETRY] Attempt {{retry_attempt+1}}/{{max_retries}} (waiting {{delay}}s): {action_desc}", flush=True)')
-                wrapped_lines.append(f"{indent_str}            time.sleep(delay)")
-                wrapped_lines.append(f"{indent_str}            # Wait for page to stabilize")
-                wrapped_lines.append(f"{indent_str}            {page_var}.wait_for_load_state('domcontentloaded', timeout=5000)")
-
-                # Add scroll_into_view_if_needed for actions with selectors
-                if has_selector and '.click()' in stripped:
-                    # Extract the element locator part (everything before .click())
-                    click_pos = stripped.find('.click()')
-                    element_part = stripped[:click_pos].strip()
-                    wrapped_lines.append(f"{indent_str}        # Try to scroll element into view if needed")
-                    wrapped_lines.append(f"{indent_str}        try:")
-                    wrapped_lines.append(f"{indent_str}            _element = {element_part}")
-                    wrapped_lines.append(f"{indent_str}            _element.scroll_into_view_if_needed(timeout=3000)")
-                    wrapped_lines.append(f"{indent_str}            time.sleep(0.2)  # Wait for scroll animation")
-                    wrapped_lines.append(f'{indent_str}            print(f"[POPUP_ACTION] Element scrolled into view", flush=True)')
-                    wrapped_lines.append(f"{indent_str}        except:")
-                    wrapped_lines.append(f'{indent_str}            print(f"[POPUP_ACTION] [WARNING] Could not scroll element, will try with original selector", flush=True)')
-                    wrapped_lines.append(f"{indent_str}            pass")
-                    # Always use original code for reliability
-                    wrapped_lines.append(f"{indent_str}        {sanitized_code}")
-                else:
-                    wrapped_lines.append(f"{indent_str}        {sanitized_code}")
-
-                wrapped_lines.append(f'{indent_str}        print(f"[POPUP_ACTION] [OK] {action_desc}", flush=True)')
-                wrapped_lines.append(f"{indent_str}        break  # Success - exit retry loop")
-                wrapped_lines.append(f"{indent_str}    except PlaywrightTimeout:")
-                wrapped_lines.append(f"{indent_str}        if retry_attempt == max_retries - 1:")
-                wrapped_lines.append(f'{indent_str}            print(f"[POPUP_ACTION] [ERROR] Failed after {{max_retries}} attempts (total {{sum(progressive_delays)}}s): {action_desc}", flush=True)')
-                # Determine at generation time if this is an optional expandable button
-                optional_keywords = ['show more', 'see more', 'load more', 'view more', 'expand', 'показать больше']
-                action_lower = action_desc.lower()
-                is_optional_button = any(keyword in action_lower for keyword in optional_keywords)
-
-                if is_optional_button:
-                    # Generate code that treats this as optional
-                    wrapped_lines.append(f"{indent_str}            # Smart detection: This appears to be an optional expandable button")
-                    wrapped_lines.append(f'{indent_str}            print(f"[POPUP_ACTION] [INFO] Button may not exist if content already loaded", flush=True)')
-                    wrapped_lines.append(f'{indent_str}            print(f"[POPUP_ACTION] [INFO] Checking page state...", flush=True)')
-                    wrapped_lines.append(f"{indent_str}            try:")
-                    wrapped_lines.append(f"{indent_str}                {page_var}.wait_for_load_state('domcontentloaded', timeout=3000)")
-                    wrapped_lines.append(f'{indent_str}                print(f"[POPUP_ACTION] [OK] Page stable - content likely already loaded, continuing...", flush=True)')
-                    wrapped_lines.append(f"{indent_str}            except:")
-                    wrapped_lines.append(f'{indent_str}                print(f"[POPUP_ACTION] [WARNING] Page check failed but treating as optional", flush=True)')
-                    wrapped_lines.append(f"{indent_str}            break  # Continue execution without raising error")
-                else:
-                    # Generate code that treats this as critical
-                    wrapped_lines.append(f"{indent_str}            raise  # Re-raise on final attempt for critical buttons")
-
-                wrapped_lines.append(f"{indent_str}        else:")
-                wrapped_lines.append(f'{indent_str}            print(f"[POPUP_RETRY] Timeout on attempt {{retry_attempt+1}}, retrying with longer delay...", flush=True)')
-                wrapped_lines.append(f"{indent_str}            continue")
+                yield self._popup_retry_call(stripped, sanitized_code, action_desc, indent_str)
             else:
                 # Keep as-is (critical actions or non-actions)
                 # But still sanitize curly quotes in critical code
@@ -883,37 +1057,108 @@ def load_csv_data() -> List[Dict]:
 
                 # Check for special command comments (e.g., #pause10, #scrolldown)
                 if stripped.startswith('#'):
-                    command_handled = self._handle_special_command(stripped, indent_str, wrapped_lines, current_page_context)
-                    if command_handled:
-                        i += 1
+                    command_lines = []
+                    if self._handle_special_command(stripped, indent_str, command_lines, current_page_context):
+                        yield from command_lines
                         continue
 
-                wrapped_lines.append(sanitized_line)
+                yield sanitized_line
 
                 # If this is a popup page assignment, add scroll verification code
                 # This helps verify page control and loads elements at the bottom
                 if '= page1_info.value' in sanitized_line or '= page2_info.value' in sanitized_line or '= page3_info.value' in sanitized_line:
                     # Extract page variable name (page1, page2, etc.)
-                    import re
                     match = re.search(r'(\w+)\s*=\s*page\d+_info\.value', sanitized_line)
                     if match:
                         page_var = match.group(1)
                         # Update current page context for special commands
                         current_page_context = page_var
-                        wrapped_lines.append(f"{indent_str}# Wait for popup page to load and stabilize")
-                        wrapped_lines.append(f"{indent_str}time.sleep(1.5)  # Extended wait for popup to fully load")
-                        wrapped_lines.append(f"{indent_str}{page_var}.wait_for_load_state('domcontentloaded')")
-                        wrapped_lines.append(f"{indent_str}try:")
-                        wrapped_lines.append(f"{indent_str}    {page_var}.wait_for_load_state('networkidle', timeout=10000)")
-                        wrapped_lines.append(f'{indent_str}    print(f"[POPUP] Network stabilized on {page_var}", flush=True)')
-                        wrapped_lines.append(f"{indent_str}except:")
-                        wrapped_lines.append(f'{indent_str}    print(f"[POPUP] Network idle timeout - continuing anyway", flush=True)')
-                        wrapped_lines.append(f"{indent_str}    pass")
-                        wrapped_lines.append(f'{indent_str}print(f"[POPUP] [OK] {page_var} page loaded - use #scrolldown/#scrollmid for manual scroll control", flush=True)')
+                        yield f"{indent_str}# Wait for popup page to load and stabilize"
+                        yield f"{indent_str}time.sleep(1.5)  # Extended wait for popup to fully load"
+                        yield f"{indent_str}{page_var}.wait_for_load_state('domcontentloaded')"
+                        yield f"{indent_str}try:"
+                        yield f"{indent_str}    {page_var}.wait_for_load_state('networkidle', timeout=10000)"
+                        yield f'{indent_str}    print(f"[POPUP] Network stabilized on {page_var}", flush=True)'
+                        yield f"{indent_str}except:"
+                        yield f'{indent_str}    print(f"[POPUP] Network idle timeout - continuing anyway", flush=True)'
+                        yield f"{indent_str}    pass"
+                        yield f'{indent_str}print(f"[POPUP] [OK] {page_var} page loaded - use #scrolldown/#scrollmid for manual scroll control", flush=True)'
+
+    def _popup_retry_call(self, stripped: str, sanitized_code: str, action_desc: str, indent_str: str) -> str:
+        """
+        Сгенерировать вызов popup_retry() для действия на popup странице (page1/page2/page3)
+
+        Сам retry-цикл живёт в helper-функции popup_retry сгенерированного скрипта,
+        здесь остаётся одна строка на действие. Хвостовой комментарий отрезается,
+        иначе он съест конец вызова. Если действие не выражение (например
+        x = page1...click()), в lambda его не поставить - тогда retry-цикл
+        генерируется прямо в коде (многострочный результат).
+
+        Args:
+            stripped: Исходная строка действия (без отступа)
+            sanitized_code: Код действия после санитизации и замены .fill()
+            action_desc: Описание действия для логов
+            indent_str: Отступ текущей строки
+        """
+        # tokenize только если в строке есть '#'
+        sanitized_code = _strip_trailing_comment(sanitized_code)
+
+        # Extract page variable and selector for smart handling
+        match = _PAGE_VAR_RE.search(sanitized_code)
+        page_var = match.group(1) if match else 'page1'
+
+        # Extract the element locator part (everything before .click()).
+        # Первый '.click()' в stripped стоит до комментария: в коде без комментария он есть
+        element_part = None
+        if '.click()' in sanitized_code and _SELECTOR_RE.search(sanitized_code):
+            element_part = stripped[:stripped.find('.click()')].strip()
+
+        # Determine at generation time if this is an optional expandable button
+        optional_keywords = ['show more', 'see more', 'load more', 'view more', 'expand', 'показать больше']
+        action_lower = action_desc.lower()
+        is_optional_button = any(keyword in action_lower for keyword in optional_keywords)
+
+        # Единственная компиляция действия на строку
+        if not _is_expression(sanitized_code):
+            return self._popup_inline_retry_block(sanitized_code, element_part, page_var,
+                                                  action_desc, is_optional_button, indent_str)
 
-            i += 1
+        args = f"{page_var}, lambda: {sanitized_code}, {action_desc!r}"
 
-        return '\n'.join(wrapped_lines)
+        # Add scroll_into_view_if_needed for actions with selectors.
+        # Обычный случай 'выражение.click()': без хвостового .click() это тоже
+        # выражение, компилировать не нужно
+        if element_part and (sanitized_code == element_part + '.click()' or _is_expression(element_part)):
+            args += f", element_fn=lambda: {element_part}"
+
+        if is_optional_button:
+            args += ", optional=True"
+
+        return f"{indent_str}popup_retry({args})"
+
+    def _popup_inline_retry_block(self, code: str, element_part, page_var: str, action_desc: str,
+                                  is_optional_button: bool, indent_str: str) -> str:
+        """
+        Retry-цикл прямо в коде для popup действия-оператора (см. _popup_retry_call)
+
+        Поведение то же, что у popup_retry(): 5 попыток с задержками 5-30s,
+        прокрутка к элементу перед click(), опциональные кнопки не падают.
+        """
+        mapping = {'I': indent_str, 'page': page_var, 'code': code, 'desc': repr(action_desc)}
+
+        # _element = x = page1.get_by_...() - валидное цепочечное присваивание
+        if element_part and _is_statement(f"_element = {element_part}"):
+            mapping['element'] = element_part
+            mapping['scroll'] = _POPUP_INLINE_SCROLL_TEMPLATE % mapping
+        else:
+            mapping['scroll'] = ''
+
+        if is_optional_button:
+            mapping['final'] = _POPUP_INLINE_FINAL_OPTIONAL_TEMPLATE % mapping
+        else:
+            mapping['final'] = _POPUP_INLINE_FINAL_CRITICAL_TEMPLATE % mapping
+
+        return _POPUP_INLINE_RETRY_TEMPLATE % mapping
 
     def _handle_special_command(self, comment: str, indent_str: str, wrapped_lines: list, page_context: str = 'page') -> bool:
         """
@@ -933,12 +1178,10 @@ def load_csv_data() -> List[Dict]:
         Returns:
             True если команда обработана, False если это обычный комментарий
         """
-        import re
-
         comment_lower = comment.lower().strip()
 
         # #pause5, #pause10, #pause20 - пауза N секунд
-        pause_match = re.match(r'#pause(\d+)', comment_lower)
+        pause_match = _PAUSE_RE.match(comment_lower)
         if pause_match:
             seconds = pause_match.group(1)
             wrapped_lines.append(f"{indent_str}# User command: pause {seconds} seconds")
@@ -1012,48 +1255,38 @@ def load_csv_data() -> List[Dict]:
 
     def _extract_action_description(self, line: str) -> str:
         """Извлечь описание действия для логирования"""
-        import re
+        # Вызываемый метод (click, fill, ...) - один проход регулярки вместо цепочки `in`
+        verb_match = _ACTION_VERB_RE.search(line)
+        verb = verb_match.group(1) if verb_match else None
 
         # Try to extract element description from various patterns
 
         # page.get_by_role("button", name="Next").click()
-        match = re.search(r'get_by_role\(["\'](\w+)["\']\s*,\s*name=["\']([^"\']+)["\']', line)
+        match = _ROLE_DESC_RE.search(line)
         if match:
             role, name = match.groups()
-            action = 'click' if '.click(' in line else 'fill' if '.fill(' in line else 'action'
+            action = verb if verb in ('click', 'fill') else 'action'
             return f"{action} {role} '{name}'"
 
         # page.get_by_text("Continue").click()
-        match = re.search(r'get_by_text\(["\']([^"\']+)["\']', line)
+        match = _TEXT_DESC_RE.search(line)
         if match:
-            text = match.group(1)
-            action = 'click' if '.click(' in line else 'action'
-            return f"{action} text '{text}'"
+            action = 'click' if verb == 'click' else 'action'
+            return f"{action} text '{match.group(1)}'"
 
         # page.get_by_placeholder("Enter name").fill(value)
-        match = re.search(r'get_by_placeholder\(["\']([^"\']+)["\']', line)
+        match = _PLACEHOLDER_DESC_RE.search(line)
         if match:
-            placeholder = match.group(1)
-            return f"fill placeholder '{placeholder}'"
+            return f"fill placeholder '{match.group(1)}'"
 
         # page.locator("#id").click()
-        match = re.search(r'locator\(["\']([^"\']+)["\']', line)
+        match = _LOCATOR_DESC_RE.search(line)
         if match:
-            selector = match.group(1)
-            action = 'click' if '.click(' in line else 'fill' if '.fill(' in line else 'action'
-            return f"{action} '{selector}'"
+            action = verb if verb in ('click', 'fill') else 'action'
+            return f"{action} '{match.group(1)}'"
 
         # Default: show the method being called
-        if '.click(' in line:
-            return "click element"
-        elif '.fill(' in line:
-            return "fill field"
-        elif '.select_option(' in line:
-            return "select option"
-        elif '.check(' in line:
-            return "check checkbox"
-
-        return "action"
+        return _VERB_DESCRIPTIONS.get(verb, "action")
 
     def _generate_main_iteration(self, user_code: str) -> str:
         # Clean user code from Playwright Recorder boilerplate
@@ -1099,6 +1332,92 @@ def run_iteration(page, data_row: Dict, iteration_number: int):
 # ГЛАВНАЯ ФУНКЦИЯ
 # ============================================================
 
+# Облачный API ограничивает частоту создания профилей (429) -
+# при параллельной обработке создаём профили по одному
+PROFILE_API_LOCK = threading.Lock()
+
+
+def process_row(data_row: Dict, iteration_number: int, total: int) -> bool:
+    """
+    Обработка одной строки CSV в собственном профиле
+
+    Создание профиля -> запуск -> итерация -> остановка.
+    Строки независимы друг от друга, поэтому функция безопасна для вызова из потоков.
+
+    Args:
+        data_row: Данные из CSV
+        iteration_number: Номер строки (начиная с 1)
+        total: Всего строк
+
+    Returns:
+        True если итерация прошла успешно, False при любой ошибке
+    """
+    print(f"\\n{'#'*60}")
+    print(f"# ROW {iteration_number}/{total}")
+    print(f"{'#'*60}")
+
+    profile_uuid = None
+
+    try:
+        # Создание профиля через API
+        profile_title = f"Auto Profile {iteration_number}"
+        print(f"[PROFILE] Создание профиля: {profile_title}")
+        with PROFILE_API_LOCK:
+            profile_uuid = create_profile(profile_title)
+
+        if not profile_uuid:
+            print("[ERROR] Не удалось создать профиль")
+            return False
+
+        print(f"[PROFILE] UUID: {profile_uuid}")
+
+        # Запуск профиля (start_profile сам ждёт синхронизации с локальным Octobrowser)
+        print("[PROFILE] Запуск...")
+        start_data = start_profile(profile_uuid)
+
+        if not start_data:
+            print("[ERROR] Не удалось запустить профиль")
+            return False
+
+        debug_url = start_data.get('ws_endpoint')
+        if not debug_url:
+            print("[ERROR] Нет CDP endpoint")
+            return False
+
+        print(f"[PROFILE] [OK] CDP endpoint получен")
+
+        # Подключение через Playwright CDP
+        with sync_playwright() as playwright:
+            browser = playwright.chromium.connect_over_cdp(debug_url)
+            context = browser.contexts[0]
+            page = context.pages[0]
+
+            page.set_default_timeout(DEFAULT_TIMEOUT)
+            page.set_default_navigation_timeout(NAVIGATION_TIMEOUT)
+
+            # Запуск итерации
+            result = run_iteration(page, data_row, iteration_number)
+
+            # Пауза перед закрытием
+            time.sleep(2)
+
+            browser.close()
+
+        print(f"[PROFILE] Остановка профиля")
+        stop_profile(profile_uuid)
+        return result
+
+    except Exception as e:
+        print(f"[ERROR] Критическая ошибка в итерации {iteration_number}: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+    finally:
+        if profile_uuid:
+            time.sleep(1)
+
+
 def main():
     """Главная функция запуска через Octobrowser API"""
     print("[MAIN] Запуск автоматизации через Octobrowser API...")
@@ -1126,99 +1445,40 @@ def main():
     # Обработка каждой строки
     success_count = 0
     fail_count = 0
-
-    for iteration_number, data_row in enumerate(csv_data, 1):
-        print(f"\\n{'#'*60}")
-        print(f"# ROW {iteration_number}/{len(csv_data)}")
-        print(f"{'#'*60}")
-
-        # Задержка между итерациями для предотвращения перегрузки API
-        if iteration_number > 1:
-            wait_time = 2
-            print(f"[API] Задержка {wait_time}s перед созданием следующего профиля...")
-            time.sleep(wait_time)
-
-        profile_uuid = None
-
-        try:
-            # Создание профиля через API
-            profile_title = f"Auto Profile {iteration_number}"
-            print(f"[PROFILE] Создание профиля: {profile_title}")
-            profile_uuid = create_profile(profile_title)
-
-            if not profile_uuid:
-                print("[ERROR] Не удалось создать профиль")
-                fail_count += 1
-                continue
-
-            print(f"[PROFILE] UUID: {profile_uuid}")
-
-            # Ожидание синхронизации профиля с локальным Octobrowser
-            print("[PROFILE] Ожидание синхронизации с локальным Octobrowser (5 сек)...")
-            time.sleep(5)
-
-            # Запуск профиля
-            print("[PROFILE] Запуск...")
-            start_data = start_profile(profile_uuid)
-
-            if not start_data:
-                print("[ERROR] Не удалось запустить профиль")
-                fail_count += 1
-                continue
-
-            debug_url = start_data.get('ws_endpoint')
-            if not debug_url:
-                print("[ERROR] Нет CDP endpoint")
-                fail_count += 1
-                continue
-
-            print(f"[PROFILE] [OK] CDP endpoint получен")
-
-            # Подключение через Playwright CDP
-            with sync_playwright() as playwright:
-                browser = playwright.chromium.connect_over_cdp(debug_url)
-                context = browser.contexts[0]
-                page = context.pages[0]
-
-                page.set_default_timeout(DEFAULT_TIMEOUT)
-                page.set_default_navigation_timeout(NAVIGATION_TIMEOUT)
-
-                # Запуск итерации
-                result = run_iteration(page, data_row, iteration_number)
-
-                if result:
+    total = len(csv_data)
+
+    if MAX_WORKERS > 1:
+        # Параллельная обработка: каждая строка в своём профиле и своём потоке
+        print(f"[MAIN] Параллельная обработка: {MAX_WORKERS} потоков")
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            futures = [
+                executor.submit(process_row, data_row, iteration_number, total)
+                for iteration_number, data_row in enumerate(csv_data, 1)
+            ]
+            for future in as_completed(futures):
+                if future.result():
                     success_count += 1
                 else:
                     fail_count += 1
+    else:
+        for iteration_number, data_row in enumerate(csv_data, 1):
+            # Фиксированной задержки перед созданием профиля нет:
+            # create_profile сам ждёт и повторяет запрос при rate limit (429)
+            if process_row(data_row, iteration_number, total):
+                success_count += 1
+            else:
+                fail_count += 1
 
-                # Пауза перед закрытием
-                time.sleep(2)
-
-                browser.close()
-
-            print(f"[PROFILE] Остановка профиля")
-            stop_profile(profile_uuid)
-
-        except Exception as e:
-            print(f"[ERROR] Критическая ошибка в итерации {iteration_number}: {e}")
-            import traceback
-            traceback.print_exc()
-            fail_count += 1
-
-        finally:
-            if profile_uuid:
-                time.sleep(1)
-
-        # Пауза между итерациями
-        if iteration_number < len(csv_data):
-            print(f"[MAIN] Пауза 3 секунды перед следующей итерацией...")
-            time.sleep(3)
+            # Пауза между итерациями
+            if iteration_number < total:
+                print(f"[MAIN] Пауза 3 секунды перед следующей итерацией...")
+                time.sleep(3)
 
     # Итоговая статистика
     print(f"\\n{'='*60}")
     print(f"[MAIN] ЗАВЕРШЕНО")
-    print(f"[MAIN] Успешно: {success_count}/{len(csv_data)}")
-    print(f"[MAIN] Ошибок: {fail_count}/{len(csv_data)}")
+    print(f"[MAIN] Успешно: {success_count}/{total}")
+    print(f"[MAIN] Ошибок: {fail_count}/{total}")
     print(f"{'='*60}")
 
 
@@ -0,0 +1,193 @@
+"""
+Тестовый скрипт для проверки popup_retry() в генераторе smart_no_api
+
+Действия на popup страницах (page1/page2/page3) превращаются в вызовы
+popup_retry(page1, lambda: ...). Проверяем:
+- сгенерированный скрипт компилируется (хвостовой комментарий, присваивание)
+- действия на popup странице стоят ПОСЛЕ блока with page.expect_popup()
+- сам helper popup_retry(): число попыток, optional=True и проброс исключения
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path.cwd()))
+
+from src.providers.smart_no_api.generator import Generator
+
+# Тестовый Playwright код: действия на popup странице
+test_code = '''
+from playwright.sync_api import Playwright, sync_playwright
+
+def run(playwright: Playwright) -> None:
+    browser = playwright.chromium.launch(headless=False)
+    context = browser.new_context()
+    page = context.new_page()
+
+    page.goto("https://example.com")
+
+    with page.expect_popup() as page1_info:
+        page.get_by_role("link", name="Open").click()
+    page1 = page1_info.value
+
+    # Хвостовой комментарий - не должен съесть конец вызова popup_retry
+    page1.get_by_text("Next").click()  # go on
+
+    # Присваивание - в lambda не поставить, нужен retry-цикл прямо в коде
+    x = page1.get_by_role("button", name="Go").click()
+
+    # '#' внутри строки - это не комментарий
+    page1.get_by_text("Step #2").click()
+
+    # Опциональная кнопка
+    page1.get_by_role("button", name="Show more").click()
+
+    context.close()
+    browser.close()
+
+with sync_playwright() as playwright:
+    run(playwright)
+'''
+
+print("=" * 80)
+print("ТЕСТ POPUP_RETRY В ГЕНЕРАТОРЕ SMART_NO_API")
+print("=" * 80)
+
+generator = Generator()
+script = generator.generate_script(test_code, {'csv_data': [{'Field 1': 'value'}]})
+lines = script.split('\n')
+
+print("\n[1] ДЕЙСТВИЯ НА POPUP СТРАНИЦЕ:")
+print("-" * 80)
+for line in lines:
+    if 'page1_info' in line or ('page1.' in line and ('popup_retry(' in line or '= page1.' in line)):
+        print(line)
+
+print("\n[2] ПРОВЕРКА ГЕНЕРАЦИИ:")
+print("-" * 80)
+
+failed = False
+
+try:
+    compile(script, '<generated>', 'exec')
+    print("✅ Сгенерированный скрипт компилируется")
+except SyntaxError as e:
+    print(f"❌ Сгенерированный скрипт НЕ компилируется: {e}")
+    failed = True
+
+
+def indent_of(prefix):
+    """Отступ первой строки скрипта, которая (без отступа) начинается с prefix"""
+    for line in lines:
+        if line.lstrip().startswith(prefix):
+            return len(line) - len(line.lstrip())
+    return None
+
+
+with_indent = indent_of('with page.expect_popup()')
+action_indents = {
+    indent_of('page1 = page1_info.value'),
+    indent_of('popup_retry(page1, lambda: page1.get_by_text("Next")'),
+    indent_of('popup_retry(page1, lambda: page1.get_by_text("Step #2")'),
+    indent_of('# Retry logic for popup page action'),
+}
+
+checks = [
+    (with_indent is not None and action_indents == {with_indent},
+     'Действия на popup странице стоят после блока with, а не внутри'),
+    (indent_of('page.get_by_role("link", name="Open").click()') == (with_indent or 0) + 4,
+     'Клик, открывающий popup, остался внутри блока with'),
+    ('popup_retry(page1, lambda: page1.get_by_text("Next").click(), ' in script,
+     'Хвостовой комментарий отрезан'),
+    ('popup_retry(page1, lambda: page1.get_by_text("Step #2").click(), ' in script,
+     "'#' внутри строки сохранен"),
+    ('lambda: x =' not in script
+     and indent_of('x = page1.get_by_role("button", name="Go").click()') == (with_indent or 0) + 8,
+     'Присваивание выполняется в retry-цикле, а не в lambda'),
+    ("\"click button 'Show more'\", element_fn=lambda: page1.get_by_role(\"button\", name=\"Show more\"), optional=True)" in script,
+     'Show more помечена optional'),
+]
+
+for ok, description in checks:
+    if ok:
+        print(f"✅ {description}")
+    else:
+        print(f"❌ {description} - НЕ выполнено")
+        failed = True
+
+print("\n[3] ПРОВЕРКА HELPER popup_retry():")
+print("-" * 80)
+
+
+class FakeTimeout(Exception):
+    """Подмена playwright TimeoutError"""
+
+
+class FakeTime:
+    """time без реального ожидания - запоминает задержки"""
+
+    def __init__(self):
+        self.sleeps = []
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+
+
+class FakePage:
+    """Страница, на которой действие падает по таймауту fail_times раз"""
+
+    def __init__(self, fail_times):
+        self.fail_times = fail_times
+        self.attempts = 0
+
+    def wait_for_load_state(self, state, timeout=None):
+        pass
+
+    def action(self):
+        self.attempts += 1
+        if self.attempts <= self.fail_times:
+            raise FakeTimeout("timeout")
+
+
+def run_popup_retry(fail_times, optional=False):
+    """Выполнить сгенерированный popup_retry() на FakePage"""
+    from typing import Dict, List, Optional
+    namespace = {
+        'time': FakeTime(),
+        'PlaywrightTimeout': FakeTimeout,
+        'Dict': Dict, 'List': List, 'Optional': Optional,
+    }
+    exec(generator._generate_helpers(), namespace)
+    page = FakePage(fail_times)
+    try:
+        result = namespace['popup_retry'](page, page.action, "test action", optional=optional)
+    except FakeTimeout:
+        result = 'raised'
+    return result, page.attempts, namespace['time'].sleeps
+
+
+result, attempts, sleeps = run_popup_retry(fail_times=2)
+helper_checks = [
+    (result is True and attempts == 3, f'2 таймаута, затем успех: True после 3 попыток (получено {result}, {attempts})'),
+    (sleeps[:2] == [5, 10], f'Задержки перед повторами 5s, 10s (получено {sleeps})'),
+]
+
+result, attempts, _ = run_popup_retry(fail_times=10, optional=True)
+helper_checks.append((result is False and attempts == 5,
+                      f'optional=True: False после 5 попыток (получено {result}, {attempts})'))
+
+result, attempts, _ = run_popup_retry(fail_times=10)
+helper_checks.append((result == 'raised' and attempts == 5,
+                      f'Не optional: исключение после 5 попыток (получено {result}, {attempts})'))
+
+for ok, description in helper_checks:
+    if ok:
+        print(f"✅ {description}")
+    else:
+        print(f"❌ {description}")
+        failed = True
+
+print("\n" + "=" * 80)
+print("ТЕСТ ЗАВЕРШЕН" if not failed else "ТЕСТ ПРОВАЛЕН")
+print("=" * 80)
+
+sys.exit(1 if failed else 0)